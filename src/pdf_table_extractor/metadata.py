@@ -1,65 +1,97 @@
 """Metadata handling for PDF processing."""
 
 import hashlib
-import json
 import logging
-from dataclasses import asdict, dataclass
+import mmap
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import blake3
+import orjson
+
 logger = logging.getLogger(__name__)
 
 METADATA_FILENAME = '.pdf_metadata.json'
 
+# Hash algorithm used for new metadata. The hash only detects changes between runs,
+# so a fast non-adversarial hash is sufficient.
+HASH_ALGORITHM = 'blake3'
+# Algorithm assumed for metadata written before the algorithm was recorded
+LEGACY_HASH_ALGORITHM = 'sha256'
+
+# New hashers are copied from these instead of constructed, which skips repeated setup.
+# The prototypes are never updated, so copying them from several threads is safe.
+_HASH_PROTOTYPES: dict[str, Any] = {
+    'blake3': blake3.blake3(),
+    'sha256': hashlib.sha256(),
+}
+
+# Files at least this large are memory-mapped for hashing; below it, mmap setup costs
+# more than it saves
+MMAP_THRESHOLD = 1 << 20
 
-@dataclass
+
+@dataclass(slots=True)
 class FileMetadata:
     """Metadata for a PDF file."""
 
     size: int
     hash: str
+    algo: str = HASH_ALGORITHM
 
     @classmethod
-    def from_file(cls, file_path: Path) -> 'FileMetadata':
+    def from_file(cls, file_path: Path, algo: str = HASH_ALGORITHM) -> 'FileMetadata':
         """Create metadata from a file."""
         stat = file_path.stat()
-        return cls(size=stat.st_size, hash=_compute_file_hash(file_path))
+        return cls(size=stat.st_size, hash=_compute_file_hash(file_path, algo), algo=algo)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> 'FileMetadata':
         """Create metadata from a dictionary."""
-        return cls(size=data['size'], hash=data['hash'])
+        algo = data.get('algo', LEGACY_HASH_ALGORITHM)
+        if algo not in _HASH_PROTOTYPES:
+            raise ValueError(f'Unsupported hash algorithm: {algo}')
+        return cls(size=data['size'], hash=data['hash'], algo=algo)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        # Built directly: asdict() deep-copies every field
+        return {'size': self.size, 'hash': self.hash, 'algo': self.algo}
 
     def matches(self, other: 'FileMetadata') -> bool:
         """Check if this metadata matches another."""
         # Only compare hash and size (content-based), not mtime (timestamp-based)
-        # This ensures validation works in CI where file timestamps differ
-        return self.size == other.size and self.hash == other.hash
+        # This ensures validation works in CI where file timestamps differ.
+        # Hashes from different algorithms are never comparable.
+        return self.size == other.size and self.algo == other.algo and self.hash == other.hash
 
 
-def _compute_file_hash(file_path: Path) -> str:
-    """Compute SHA256 hash of a file."""
-    sha256_hash = hashlib.sha256()
+def _compute_file_hash(file_path: Path, algo: str = HASH_ALGORITHM) -> str:
+    """Compute the hash of a file using the given algorithm."""
     with file_path.open('rb') as f:
-        for byte_block in iter(lambda: f.read(4096), b''):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            # Hash straight from the page cache, without copying into Python buffers
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher = _HASH_PROTOTYPES[algo].copy()
+                hasher.update(mm)
+                digest: str = hasher.hexdigest()
+                return digest
+
+        # file_digest reads into a reusable buffer, avoiding per-chunk allocations
+        return hashlib.file_digest(f, _HASH_PROTOTYPES[algo].copy).hexdigest()
 
 
 def load_metadata(output_dir: Path) -> FileMetadata | None:
     """Load metadata from output directory."""
     metadata_path = output_dir / METADATA_FILENAME
-    if not metadata_path.exists():
-        return None
-
     try:
-        with metadata_path.open() as f:
-            data = json.load(f)
-            return FileMetadata.from_dict(data)
+        data = orjson.loads(metadata_path.read_bytes())
+        return FileMetadata.from_dict(data)
+    except FileNotFoundError:
+        # Cheaper than checking existence first, which costs an extra stat() per PDF
+        return None
     except Exception as e:
         logger.warning(f'Failed to load metadata from {metadata_path}: {e}')
         return None
@@ -69,39 +101,87 @@ def save_metadata(output_dir: Path, metadata: FileMetadata) -> None:
     """Save metadata to output directory."""
     metadata_path = output_dir / METADATA_FILENAME
     try:
-        with metadata_path.open('w') as f:
-            json.dump(metadata.to_dict(), f, indent=2)
+        # Compact output: metadata is read far more often than humans look at it
+        metadata_path.write_bytes(orjson.dumps(metadata.to_dict()))
     except Exception as e:
         logger.warning(f'Failed to save metadata to {metadata_path}: {e}')
 
 
-def should_skip_pdf(pdf_path: Path, output_dir: Path) -> tuple[bool, str]:
+def should_skip_pdf(
+    pdf_path: Path,
+    output_dir: Path,
+    current_metadata: FileMetadata | None = None,
+    trust_mtime: bool = True,
+) -> tuple[bool, str]:
     """
     Check if PDF should be skipped based on metadata.
 
+    Args:
+        pdf_path: Path to the PDF file
+        output_dir: Directory containing the PDF's output directory
+        current_metadata: Already computed metadata of the PDF, to avoid hashing it again
+        trust_mtime: Skip without hashing if the sizes match and the metadata file is not
+            older than the PDF. Disable for full content verification (e.g. in CI, where
+            file timestamps come from the checkout).
+
     Returns:
         Tuple of (should_skip, reason) where reason explains why it shouldn't be skipped
     """
-    pdf_output_dir = output_dir / pdf_path.stem
+    should_skip, reason, _ = check_pdf(pdf_path, output_dir, current_metadata, trust_mtime)
+    return (should_skip, reason)
 
-    if not pdf_output_dir.exists():
-        return (False, 'not processed (output directory missing)')
+
+def check_pdf(
+    pdf_path: Path,
+    output_dir: Path,
+    current_metadata: FileMetadata | None = None,
+    trust_mtime: bool = True,
+) -> tuple[bool, str, FileMetadata | None]:
+    """
+    Check if PDF should be skipped, like should_skip_pdf.
+
+    Also returns the PDF's metadata if the check hashed it with HASH_ALGORITHM, so a
+    PDF that needs processing doesn't have to be hashed again.
+
+    Returns:
+        Tuple of (should_skip, reason, metadata) where metadata is None unless the PDF
+        was hashed with HASH_ALGORITHM
+    """
+    pdf_output_dir = output_dir / pdf_path.stem
 
     existing_metadata = load_metadata(pdf_output_dir)
     if not existing_metadata:
-        return (False, 'not processed (metadata missing)')
-
-    current_metadata = FileMetadata.from_file(pdf_path)
+        # Only look at the output directory when explaining why, to keep the common
+        # (processed) path to as few syscalls as possible
+        if not pdf_output_dir.exists():
+            return (False, 'not processed (output directory missing)', None)
+        return (False, 'not processed (metadata missing)', None)
+
+    # A size mismatch already proves the file changed, so avoid hashing it
+    pdf_stat = pdf_path.stat()
+    current_size = pdf_stat.st_size
+    if existing_metadata.size != current_size:
+        return (False, f'out of date (size: {existing_metadata.size} → {current_size})', None)
+
+    # Like make: metadata written after the PDF was last modified is up to date
+    if trust_mtime:
+        metadata_stat = (pdf_output_dir / METADATA_FILENAME).stat()
+        if metadata_stat.st_mtime_ns >= pdf_stat.st_mtime_ns:
+            return (True, '', None)
+
+    # Hash with the stored algorithm so metadata written with an older algorithm stays valid
+    if current_metadata is None or current_metadata.algo != existing_metadata.algo:
+        current_metadata = FileMetadata(
+            size=current_size,
+            hash=_compute_file_hash(pdf_path, existing_metadata.algo),
+            algo=existing_metadata.algo,
+        )
+
+    # New metadata is always saved with HASH_ALGORITHM, so a legacy hash can't be reused
+    metadata = current_metadata if current_metadata.algo == HASH_ALGORITHM else None
 
     if existing_metadata.matches(current_metadata):
-        return (True, '')
-
-    # Metadata exists but doesn't match - file has changed
-    changes = []
-    if existing_metadata.size != current_metadata.size:
-        changes.append(f'size: {existing_metadata.size} → {current_metadata.size}')
-    if existing_metadata.hash != current_metadata.hash:
-        changes.append('hash changed')
+        return (True, '', metadata)
 
-    reason = f'out of date ({", ".join(changes)})'
-    return (False, reason)
+    # Metadata exists but doesn't match - file content has changed
+    return (False, 'out of date (hash changed)', metadata)
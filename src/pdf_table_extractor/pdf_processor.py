@@ -1,17 +1,40 @@
 """PDF table extraction processor."""
 
+import importlib
+import itertools
 import logging
+import multiprocessing
 import os
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import shutil
+import sys
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.context import BaseContext
 from pathlib import Path
 from typing import Any
 
 import camelot  # pyright: ignore[reportMissingImports]
+from pypdf import PdfReader
 
-from pdf_table_extractor.metadata import FileMetadata, save_metadata, should_skip_pdf
+from pdf_table_extractor.metadata import (
+    METADATA_FILENAME,
+    FileMetadata,
+    check_pdf,
+    save_metadata,
+    should_skip_pdf,
+)
 
 logger = logging.getLogger(__name__)
 
+# PDFs with more pages than this are split into page ranges processed in parallel
+PAGE_CHUNK_SIZE = 50
+
+# Output formats that export one file per table, so page ranges can export independently
+_SPLIT_FORMATS = frozenset({'csv', 'json', 'html', 'markdown'})
+
+# Hashes PDFs in the background while Camelot parses them (one per process)
+_hash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-hash')
+
 
 def extract_tables_from_pdf(
     pdf_path: Path,
@@ -20,6 +43,8 @@ def extract_tables_from_pdf(
     flavor: str = 'stream',
     pages: str = 'all',
     skip_existing: bool = True,
+    trust_mtime: bool = True,
+    metadata: FileMetadata | None = None,
 ) -> tuple[str, bool, str | None]:
     """
     Extract tables from a PDF file and save to the specified format.
@@ -31,35 +56,69 @@ def extract_tables_from_pdf(
         flavor: Camelot flavor ('stream' or 'lattice')
         pages: Pages to process (default: 'all', or e.g., '1', '1-3', '1,3,5')
         skip_existing: Whether to skip PDFs that have already been processed
+        trust_mtime: Whether the skip check may trust file timestamps instead of hashing
+        metadata: Metadata of the PDF if it has already been hashed
 
     Returns:
         Tuple of (filename, success, error_message)
     """
+    # When the skip check has to hash the PDF, hash it once and reuse it for the saved
+    # metadata. With trusted timestamps the skip check usually doesn't hash at all.
+    if metadata is None and skip_existing and not trust_mtime:
+        metadata = FileMetadata.from_file(pdf_path)
+
     if skip_existing:
-        should_skip, _skip_reason = should_skip_pdf(pdf_path, output_dir)
+        should_skip, _skip_reason = should_skip_pdf(pdf_path, output_dir, metadata, trust_mtime)
         if should_skip:
             return (pdf_path.name, True, 'skipped (already processed)')
 
+    # Hashing is I/O and releases the GIL while Camelot's parsing is CPU-bound, so
+    # overlap the two instead of hashing after extraction
+    metadata_future = _hash_in_background(pdf_path, metadata)
+
     try:
         tables: Any = camelot.read_pdf(str(pdf_path), flavor=flavor, pages=pages)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        metadata = metadata_future.result()
+        return _save_tables(tables, pdf_path, output_dir, output_format, metadata)
 
-        if not tables:
-            return (pdf_path.name, True, 'no tables found')
+    except Exception as e:
+        return (pdf_path.name, False, str(e))
 
-        base_name = pdf_path.stem
-        pdf_output_dir = output_dir / base_name
-        pdf_output_dir.mkdir(parents=True, exist_ok=True)
 
-        _export_tables(tables, pdf_output_dir, base_name, output_format)
+def _hash_in_background(
+    pdf_path: Path, metadata: FileMetadata | None = None
+) -> Future[FileMetadata]:
+    """Hash a PDF on the background hashing thread, unless its metadata is already known."""
+    if metadata is None:
+        return _hash_executor.submit(FileMetadata.from_file, pdf_path)
+    future: Future[FileMetadata] = Future()
+    future.set_result(metadata)
+    return future
 
-        # Save metadata after successful processing
-        metadata = FileMetadata.from_file(pdf_path)
-        save_metadata(pdf_output_dir, metadata)
 
-        return (pdf_path.name, True, f'{len(tables)} table(s)')  # pyright: ignore[reportUnknownArgumentType]
+def _save_tables(
+    tables: Any,
+    pdf_path: Path,
+    output_dir: Path,
+    output_format: str,
+    metadata: FileMetadata | None = None,
+) -> tuple[str, bool, str | None]:
+    """Export the tables extracted from a PDF and save the PDF's metadata."""
+    if not tables:
+        return (pdf_path.name, True, 'no tables found')
 
-    except Exception as e:
-        return (pdf_path.name, False, str(e))
+    base_name = pdf_path.stem
+    pdf_output_dir = output_dir / base_name
+    pdf_output_dir.mkdir(parents=True, exist_ok=True)
+
+    _export_tables(tables, pdf_output_dir, base_name, output_format)
+
+    # Save metadata after successful processing
+    if metadata is None:
+        metadata = FileMetadata.from_file(pdf_path)
+    save_metadata(pdf_output_dir, metadata)
+
+    return (pdf_path.name, True, f'{len(tables)} table(s)')  # pyright: ignore[reportUnknownArgumentType]
 
 
 def _export_tables(tables: Any, output_dir: Path, base_name: str, output_format: str) -> None:
@@ -86,21 +145,309 @@ def _export_tables(tables: Any, output_dir: Path, base_name: str, output_format:
         tables.export(str(output_path), f=fmt)
 
 
-def _process_single_pdf(
+# Arguments of _process_single_pdf:
+# (pdf_path, input_dir, output_dir, output_format, flavor, pages, metadata)
+_PdfTask = tuple[Path, Path, Path, str, str, str, FileMetadata | None]
+
+# Arguments of _export_pdf_pages: (pdf_path, pdf_output_dir, output_format, flavor, pages)
+_PageTask = tuple[Path, Path, str, str, str]
+
+# Heavy dependencies imported once per worker process at startup
+_PRELOAD_MODULES = ('camelot', 'numpy', 'pandas')
+
+
+def _worker_init() -> None:
+    """Import heavy dependencies so a worker's first task doesn't pay the import cost."""
+    for module in _PRELOAD_MODULES:
+        importlib.import_module(module)
+
+
+def _worker_context() -> BaseContext | None:
+    """
+    Get the multiprocessing context for worker processes.
+
+    Outside Windows, workers are forked from a forkserver that has already imported
+    the heavy dependencies. That makes starting a worker cheap, and it avoids forking
+    the main process after it has started threads.
+    """
+    if sys.platform == 'win32':
+        return None
+    ctx = multiprocessing.get_context('forkserver')
+    ctx.set_forkserver_preload([__name__, *_PRELOAD_MODULES])
+    return ctx
+
+
+def _process_single_pdf(task: _PdfTask) -> tuple[str, bool, str | None]:
+    """Process a single PDF file (used for parallel processing)."""
+    pdf_path, input_dir, output_dir, output_format, flavor, pages, metadata = task
+    relative_path = pdf_path.relative_to(input_dir)
+    pdf_output_dir = output_dir / relative_path.parent
+    try:
+        # process_directory has already checked whether the PDF needs processing
+        return extract_tables_from_pdf(
+            pdf_path,
+            pdf_output_dir,
+            output_format,
+            flavor,
+            pages,
+            skip_existing=False,
+            metadata=metadata,
+        )
+    except Exception as e:
+        return (pdf_path.name, False, f'unexpected error: {e}')
+
+
+def _page_chunks(pdf_path: Path, chunk_size: int = PAGE_CHUNK_SIZE) -> list[str]:
+    """Split a PDF's pages into Camelot page ranges of at most chunk_size pages."""
+    try:
+        num_pages = len(PdfReader(pdf_path).pages)
+    except Exception as e:
+        # Leave unreadable PDFs whole so Camelot reports the error
+        logger.debug(f'Failed to count pages of {pdf_path}: {e}')
+        return ['all']
+
+    return [
+        f'{start}-{min(start + chunk_size - 1, num_pages)}'
+        for start in range(1, num_pages + 1, chunk_size)
+    ]
+
+
+def _export_pdf_pages(task: _PageTask) -> tuple[int, str | None]:
+    """
+    Export the tables of a page range of a PDF (used for parallel processing).
+
+    Only the table count goes back to the main process, not the tables themselves.
+
+    Returns:
+        Tuple of (table_count, error_message)
+    """
+    pdf_path, pdf_output_dir, output_format, flavor, pages = task
+    try:
+        tables: Any = camelot.read_pdf(str(pdf_path), flavor=flavor, pages=pages)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        if tables:
+            pdf_output_dir.mkdir(parents=True, exist_ok=True)
+            _export_tables(tables, pdf_output_dir, pdf_path.stem, output_format)
+        return (len(tables), None)  # pyright: ignore[reportUnknownArgumentType]
+    except Exception as e:
+        return (0, str(e))
+
+
+def _collect_page_chunks(
+    pdf_path: Path,
+    chunk_results: list[tuple[int, str | None]],
+    pdf_output_dir: Path,
+    metadata: Future[FileMetadata],
+) -> tuple[str, bool, str | None]:
+    """Combine the results of a split PDF's page ranges and save the PDF's metadata."""
+    for _, error in chunk_results:
+        if error is not None:
+            return (pdf_path.name, False, error)
+
+    num_tables = sum(count for count, _ in chunk_results)
+    if not num_tables:
+        return (pdf_path.name, True, 'no tables found')
+
+    try:
+        save_metadata(pdf_output_dir, metadata.result())
+    except Exception as e:
+        return (pdf_path.name, False, str(e))
+    return (pdf_path.name, True, f'{num_tables} table(s)')
+
+
+def _iter_pdfs(root: Path, recursive: bool) -> Iterator[Path]:
+    """
+    Yield PDF files under root in sorted path order.
+
+    Uses os.scandir directly so directory entries need no extra stat() calls or
+    Path objects unless they are PDFs. Hidden directories are skipped. Like Path.glob,
+    directories that can't be read (including a missing root) yield nothing.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        logger.debug(f'Failed to read directory {root}: {e}')
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if recursive and not entry.name.startswith('.'):
+                yield from _iter_pdfs(Path(entry.path), recursive)
+        elif entry.name.endswith('.pdf') and entry.is_file():
+            yield Path(entry.path)
+
+
+def _hash_candidate(pdf_path: Path) -> FileMetadata | None:
+    """Hash a possible duplicate, or return None if it can't be read."""
+    try:
+        return FileMetadata.from_file(pdf_path)
+    except OSError as e:
+        # Leave the PDF out of deduplication so its own task reports the error
+        logger.debug(f'Failed to hash {pdf_path}: {e}')
+        return None
+
+
+def _find_duplicates(
+    pdf_files: list[Path],
+    sizes: dict[Path, int],
+    known_metadata: dict[Path, FileMetadata],
+    max_workers: int,
+) -> dict[Path, tuple[FileMetadata, list[Path]]]:
+    """
+    Group PDFs with identical content.
+
+    Only PDFs that share their size with another PDF are hashed, so this costs nothing
+    when there are no duplicates. PDFs that can't be read are never grouped. PDFs in
+    known_metadata are not hashed again, and new hashes are added to it.
+
+    Returns:
+        Dictionary mapping the first PDF of each group to its metadata and the other
+        PDFs of the group
+    """
+    by_size: dict[int, list[Path]] = {}
+    for pdf_path in pdf_files:
+        by_size.setdefault(sizes[pdf_path], []).append(pdf_path)
+    candidates = [pdf_path for group in by_size.values() if len(group) > 1 for pdf_path in group]
+    if not candidates:
+        return {}
+
+    unhashed = [pdf_path for pdf_path in candidates if pdf_path not in known_metadata]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        all_metadata = executor.map(_hash_candidate, unhashed)
+        for pdf_path, metadata in zip(unhashed, all_metadata, strict=True):
+            if metadata is not None:
+                known_metadata[pdf_path] = metadata
+
+    by_hash: dict[str, list[Path]] = {}
+    for pdf_path in candidates:
+        if pdf_path in known_metadata:
+            by_hash.setdefault(known_metadata[pdf_path].hash, []).append(pdf_path)
+
+    return {
+        group[0]: (known_metadata[group[0]], group[1:])
+        for group in by_hash.values()
+        if len(group) > 1
+    }
+
+
+def _copy_tables(source_dir: Path, source_stem: str, target_dir: Path, target_stem: str) -> None:
+    """Copy a PDF's exported tables to the output directory of an identical PDF."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with os.scandir(source_dir) as it:
+        for entry in it:
+            if entry.name == METADATA_FILENAME or not entry.is_file():
+                continue
+            # Exported files are named after the PDF, so rename them for the copy
+            name = entry.name
+            if name.startswith(source_stem):
+                name = target_stem + name[len(source_stem) :]
+            shutil.copyfile(entry.path, target_dir / name)
+
+
+def _process_duplicates(
+    source_path: Path,
+    result: tuple[str, bool, str | None],
+    metadata: FileMetadata,
+    duplicates: list[Path],
+    input_dir: Path,
+    output_dir: Path,
+) -> list[tuple[str, bool, str | None]]:
+    """Give identical copies of a processed PDF its outputs without extracting them again."""
+    _, success, message = result
+    if not success or (message and 'no tables' in message):
+        return [(duplicate_path.name, success, message) for duplicate_path in duplicates]
+
+    source_dir = output_dir / source_path.relative_to(input_dir).parent / source_path.stem
+    duplicate_results: list[tuple[str, bool, str | None]] = []
+    for duplicate_path in duplicates:
+        target_dir = output_dir / duplicate_path.relative_to(input_dir).parent / duplicate_path.stem
+        try:
+            _copy_tables(source_dir, source_path.stem, target_dir, duplicate_path.stem)
+            save_metadata(target_dir, metadata)
+            duplicate_results.append(
+                (duplicate_path.name, True, f'{message} (copied from {source_path.name})')
+            )
+        except Exception as e:
+            duplicate_results.append((duplicate_path.name, False, str(e)))
+    return duplicate_results
+
+
+def _report_result(
     pdf_path: Path,
+    result: tuple[str, bool, str | None],
+    duplicates: dict[Path, tuple[FileMetadata, list[Path]]],
     input_dir: Path,
     output_dir: Path,
-    output_format: str,
-    flavor: str,
-    pages: str,
-    skip_existing: bool,
-) -> tuple[str, bool, str | None]:
-    """Process a single PDF file (used for parallel processing)."""
+) -> tuple[int, int]:
+    """
+    Log the result of processing a PDF, and of the PDF's duplicates.
+
+    Returns:
+        Tuple of (success_count, error_count)
+    """
+    pdf_results = [result]
+    if pdf_path in duplicates:
+        metadata, group = duplicates[pdf_path]
+        pdf_results += _process_duplicates(pdf_path, result, metadata, group, input_dir, output_dir)
+
+    success_count = 0
+    error_count = 0
+    for filename, success, message in pdf_results:
+        if success:
+            if message and 'no tables' in message:
+                logger.warning(f'⚠ {filename}: {message}')
+            else:
+                logger.info(f'✓ {filename}: {message}')
+            success_count += 1
+        else:
+            logger.error(f'✗ {filename}: {message}')
+            error_count += 1
+    return (success_count, error_count)
+
+
+def _check_single_pdf(
+    pdf_path: Path,
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    trust_mtime: bool,
+) -> tuple[bool, str, FileMetadata | None]:
+    """Check whether a single PDF is processed (used for parallel checks)."""
     relative_path = pdf_path.relative_to(input_dir)
     pdf_output_dir = output_dir / relative_path.parent
-    return extract_tables_from_pdf(
-        pdf_path, pdf_output_dir, output_format, flavor, pages, skip_existing
-    )
+    try:
+        return check_pdf(pdf_path, pdf_output_dir, trust_mtime=trust_mtime)
+    except Exception as e:
+        # One unreadable PDF must not abort the others. It counts as unprocessed, so
+        # processing gives it a task that reports the failure.
+        return (False, f'unexpected error: {e}', None)
+
+
+def _check_pdfs(
+    pdf_files: list[Path],
+    input_dir: Path,
+    output_dir: Path,
+    max_workers: int,
+    *,
+    trust_mtime: bool,
+) -> list[tuple[Path, tuple[bool, str, FileMetadata | None]]]:
+    """
+    Check which PDFs are processed.
+
+    Hashing releases the GIL, so threads are enough to spread the work across cores.
+
+    Returns:
+        List of (pdf_path, (should_skip, reason, metadata)) in input order, where
+        metadata is set if the check hashed the PDF
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        skip_checks = executor.map(
+            lambda pdf_path: _check_single_pdf(
+                pdf_path, input_dir, output_dir, trust_mtime=trust_mtime
+            ),
+            pdf_files,
+        )
+        return list(zip(pdf_files, skip_checks, strict=True))
 
 
 def process_directory(
@@ -131,8 +478,7 @@ def process_directory(
     Returns:
         True if all PDFs are processed (or processing succeeded), False if validation failed
     """
-    pattern = '**/*.pdf' if recursive else '*.pdf'
-    pdf_files = sorted(input_dir.glob(pattern))
+    pdf_files = list(_iter_pdfs(input_dir, recursive))
 
     if not pdf_files:
         logger.warning(f'No PDF files found in {input_dir}')
@@ -144,18 +490,16 @@ def process_directory(
     logger.info(
         f'Found {len(pdf_files)} PDF file(s) to {"validate" if validate_only else "process"}'
     )
-    if not validate_only:
-        logger.info(f'Using {max_workers} parallel worker(s)')
+    logger.info(f'Using {max_workers} parallel worker(s)')
 
     unprocessed_files: list[str] = []
 
     if validate_only:
-        # Validation mode - check if PDFs are processed
-        for pdf_path in pdf_files:
-            relative_path = pdf_path.relative_to(input_dir)
-            pdf_output_dir = output_dir / relative_path.parent
+        # Validation mode - check if PDFs are processed. Timestamps are not meaningful
+        # after a checkout, so always verify content.
+        checked = _check_pdfs(pdf_files, input_dir, output_dir, max_workers, trust_mtime=False)
 
-            should_skip, skip_reason = should_skip_pdf(pdf_path, pdf_output_dir)
+        for pdf_path, (should_skip, skip_reason, _metadata) in checked:
             if not should_skip:
                 logger.error(f'❌ {pdf_path.name}: {skip_reason}')
                 unprocessed_files.append(pdf_path.name)
@@ -173,43 +517,131 @@ def process_directory(
     skipped_count = 0
     error_count = 0
 
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_pdf = {
-            executor.submit(
-                _process_single_pdf,
-                pdf_path,
-                input_dir,
-                output_dir,
-                output_format,
-                flavor,
-                pages,
-                skip_existing,
-            ): pdf_path
-            for pdf_path in pdf_files
-        }
-
-        # Process results as they complete
-        for future in as_completed(future_to_pdf):
-            pdf_path = future_to_pdf[future]
-            try:
-                filename, success, message = future.result()
-                if success:
-                    if message and 'skipped' in message:
-                        logger.info(f'⊘ {filename}: {message}')
-                        skipped_count += 1
-                    elif message and 'no tables' in message:
-                        logger.warning(f'⚠ {filename}: {message}')
-                        success_count += 1
-                    else:
-                        logger.info(f'✓ {filename}: {message}')
-                        success_count += 1
+    # Check which PDFs need work before dispatching, so only those are sent to (and
+    # possibly split across) the worker processes
+    # PDFs are hashed at most once per run: hashes computed by the skip checks and by
+    # finding duplicates are passed on to the tasks that save the metadata
+    pending_files = pdf_files
+    known_metadata: dict[Path, FileMetadata] = {}
+    if skip_existing:
+        checked = _check_pdfs(pdf_files, input_dir, output_dir, max_workers, trust_mtime=True)
+
+        pending_files = []
+        for pdf_path, (should_skip, _skip_reason, metadata) in checked:
+            if should_skip:
+                logger.info(f'⊘ {pdf_path.name}: skipped (already processed)')
+                skipped_count += 1
+            else:
+                pending_files.append(pdf_path)
+                if metadata is not None:
+                    known_metadata[pdf_path] = metadata
+
+    # Camelot runtime grows with PDF size, so start the largest PDFs first to keep one
+    # big straggler from stretching the total runtime. Tasks are dispatched one at a
+    # time: batching consecutive tasks would put the largest PDFs on the same worker.
+    sizes = {pdf_path: pdf_path.stat().st_size for pdf_path in pending_files}
+    by_size = sorted(pending_files, key=sizes.__getitem__, reverse=True)
+
+    # Identical PDFs are only extracted once; the others get copies of the outputs
+    duplicates = _find_duplicates(by_size, sizes, known_metadata, max_workers)
+    duplicate_paths = {
+        duplicate_path for _, group in duplicates.values() for duplicate_path in group
+    }
+    by_size = [pdf_path for pdf_path in by_size if pdf_path not in duplicate_paths]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=_worker_context(), initializer=_worker_init
+    ) as executor:
+        # Every PDF gets a result, even if the result stream breaks
+        reported: set[Path] = set()
+        try:
+            # Long PDFs are split into page ranges so they don't occupy a single worker
+            # while the others sit idle. Counting pages parses the PDF, so that runs in
+            # the workers as well. Page ranges export their tables independently, so
+            # formats that write all tables to one file are never split.
+            if pages == 'all' and output_format in _SPLIT_FORMATS:
+                all_page_chunks: Iterator[list[str]] = executor.map(_page_chunks, by_size)
+            else:
+                all_page_chunks = ([pages] for _ in by_size)
+
+            tasks: list[_PdfTask] = []
+            split_pdfs: dict[Path, list[str]] = {}
+            for pdf_path, page_chunks in zip(by_size, all_page_chunks, strict=True):
+                if len(page_chunks) > 1:
+                    split_pdfs[pdf_path] = page_chunks
                 else:
-                    logger.error(f'✗ {filename}: {message}')
-                    error_count += 1
-            except Exception as e:
-                logger.error(f'✗ {pdf_path.name}: unexpected error: {e}')
-                error_count += 1
+                    tasks.append(
+                        (
+                            pdf_path,
+                            input_dir,
+                            output_dir,
+                            output_format,
+                            flavor,
+                            pages,
+                            known_metadata.get(pdf_path),
+                        )
+                    )
+
+            # Split PDFs are the largest ones, so their page ranges are submitted first.
+            # Like the other tasks, their results stream back in order, so each split PDF
+            # takes its page ranges' results off the front without keeping Future
+            # objects around. The main process hashes split PDFs while they're exported.
+            split_dirs = {
+                pdf_path: output_dir / pdf_path.relative_to(input_dir).parent / pdf_path.stem
+                for pdf_path in split_pdfs
+            }
+            page_tasks: list[_PageTask] = [
+                (pdf_path, split_dirs[pdf_path], output_format, flavor, page_range)
+                for pdf_path, page_chunks in split_pdfs.items()
+                for page_range in page_chunks
+            ]
+            page_results = executor.map(_export_pdf_pages, page_tasks)
+            split_metadata = {
+                pdf_path: _hash_in_background(pdf_path, known_metadata.get(pdf_path))
+                for pdf_path in split_pdfs
+            }
+            results = itertools.chain(
+                zip(
+                    (task[0] for task in tasks),
+                    executor.map(_process_single_pdf, tasks),
+                    strict=True,
+                ),
+                (
+                    (
+                        pdf_path,
+                        _collect_page_chunks(
+                            pdf_path,
+                            list(itertools.islice(page_results, len(page_chunks))),
+                            split_dirs[pdf_path],
+                            split_metadata[pdf_path],
+                        ),
+                    )
+                    for pdf_path, page_chunks in split_pdfs.items()
+                ),
+            )
+
+            for pdf_path, result in results:
+                successes, errors = _report_result(
+                    pdf_path, result, duplicates, input_dir, output_dir
+                )
+                success_count += successes
+                error_count += errors
+                reported.add(pdf_path)
+        except Exception as e:
+            # A dead worker (BrokenProcessPool) or a task that can't be pickled ends the
+            # result stream, so report every PDF still waiting for a result as failed
+            for pdf_path in by_size:
+                if pdf_path in reported:
+                    continue
+                successes, errors = _report_result(
+                    pdf_path,
+                    (pdf_path.name, False, f'unexpected error: {e}'),
+                    duplicates,
+                    input_dir,
+                    output_dir,
+                )
+                success_count += successes
+                error_count += errors
 
     # Summary
     total = len(pdf_files)
@@ -1,10 +1,24 @@
 """Tests for metadata module."""
 
+import hashlib
+import json
+import os
 from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch
 
-from pdf_table_extractor.metadata import FileMetadata, load_metadata, save_metadata, should_skip_pdf
+import blake3
+import pytest
+
+from pdf_table_extractor.metadata import (
+    METADATA_FILENAME,
+    MMAP_THRESHOLD,
+    FileMetadata,
+    check_pdf,
+    load_metadata,
+    save_metadata,
+    should_skip_pdf,
+)
 
 
 def test_file_metadata_from_dict() -> None:
@@ -14,6 +28,23 @@ def test_file_metadata_from_dict() -> None:
 
     assert metadata.size == 1024
     assert metadata.hash == 'abc123'
+    assert metadata.algo == 'sha256'
+
+
+def test_file_metadata_from_dict_with_algo() -> None:
+    """Test creating FileMetadata from dictionary with a recorded hash algorithm."""
+    data: dict[str, Any] = {'size': 1024, 'hash': 'abc123', 'algo': 'blake3'}
+    metadata = FileMetadata.from_dict(data)
+
+    assert metadata.algo == 'blake3'
+
+
+def test_file_metadata_from_dict_unsupported_algo() -> None:
+    """Test creating FileMetadata from dictionary with an unknown hash algorithm."""
+    data: dict[str, Any] = {'size': 1024, 'hash': 'abc123', 'algo': 'md5'}
+
+    with pytest.raises(ValueError, match='Unsupported hash algorithm'):
+        FileMetadata.from_dict(data)
 
 
 def test_file_metadata_to_dict() -> None:
@@ -21,7 +52,7 @@ def test_file_metadata_to_dict() -> None:
     metadata = FileMetadata(size=1024, hash='abc123')
     data = metadata.to_dict()
 
-    assert data == {'size': 1024, 'hash': 'abc123'}
+    assert data == {'size': 1024, 'hash': 'abc123', 'algo': 'blake3'}
 
 
 def test_file_metadata_matches() -> None:
@@ -30,10 +61,12 @@ def test_file_metadata_matches() -> None:
     metadata2 = FileMetadata(size=1024, hash='abc123')
     metadata3 = FileMetadata(size=2048, hash='abc123')
     metadata4 = FileMetadata(size=1024, hash='def456')
+    metadata5 = FileMetadata(size=1024, hash='abc123', algo='sha256')
 
     assert metadata1.matches(metadata2)
     assert not metadata1.matches(metadata3)
     assert not metadata1.matches(metadata4)
+    assert not metadata1.matches(metadata5)
 
 
 def test_load_metadata_not_exists(tmp_path: Path) -> None:
@@ -65,8 +98,20 @@ def test_should_skip_pdf_no_output_dir(tmp_path: Path) -> None:
     assert 'output directory missing' in reason
 
 
-@patch('pdf_table_extractor.metadata.FileMetadata.from_file')
-def test_should_skip_pdf_unchanged(mock_from_file: Mock, tmp_path: Path) -> None:
+def test_should_skip_pdf_no_metadata(tmp_path: Path) -> None:
+    """Test skipping when output directory exists but has no metadata."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_text('fake pdf')
+    output_dir = tmp_path / 'output'
+    (output_dir / 'test').mkdir(parents=True)
+
+    should_skip, reason = should_skip_pdf(pdf_path, output_dir)
+    assert not should_skip
+    assert reason == 'not processed (metadata missing)'
+
+
+@patch('pdf_table_extractor.metadata._compute_file_hash')
+def test_should_skip_pdf_unchanged(mock_compute_hash: Mock, tmp_path: Path) -> None:
     """Test skipping when PDF hasn't changed."""
     pdf_path = tmp_path / 'test.pdf'
     pdf_path.write_text('fake pdf')
@@ -75,11 +120,180 @@ def test_should_skip_pdf_unchanged(mock_from_file: Mock, tmp_path: Path) -> None
     pdf_output_dir = output_dir / 'test'
     pdf_output_dir.mkdir(parents=True)
 
-    metadata = FileMetadata(size=1024, hash='abc123')
+    metadata = FileMetadata(size=8, hash='abc123')
     save_metadata(pdf_output_dir, metadata)
 
-    mock_from_file.return_value = metadata
+    mock_compute_hash.return_value = 'abc123'
+
+    should_skip, reason = should_skip_pdf(pdf_path, output_dir, trust_mtime=False)
+    assert should_skip
+    assert reason == ''
+
+
+@patch('pdf_table_extractor.metadata._compute_file_hash')
+def test_should_skip_pdf_size_changed(mock_compute_hash: Mock, tmp_path: Path) -> None:
+    """Test that a size change is detected without hashing the PDF."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_text('fake pdf')
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    save_metadata(pdf_output_dir, FileMetadata(size=1024, hash='abc123'))
+
+    should_skip, reason = should_skip_pdf(pdf_path, output_dir)
+    assert not should_skip
+    assert reason == 'out of date (size: 1024 → 8)'
+    mock_compute_hash.assert_not_called()
+
+
+@patch('pdf_table_extractor.metadata._compute_file_hash')
+def test_should_skip_pdf_with_current_metadata(mock_compute_hash: Mock, tmp_path: Path) -> None:
+    """Test that precomputed metadata is used instead of hashing the PDF again."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_text('fake pdf')
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+
+    metadata = FileMetadata(size=8, hash='abc123')
+    save_metadata(pdf_output_dir, metadata)
+
+    should_skip, reason = should_skip_pdf(pdf_path, output_dir, metadata, trust_mtime=False)
+    assert should_skip
+    assert reason == ''
+    mock_compute_hash.assert_not_called()
+
+
+@patch('pdf_table_extractor.metadata._compute_file_hash')
+def test_should_skip_pdf_trusts_newer_metadata(mock_compute_hash: Mock, tmp_path: Path) -> None:
+    """Test skipping without hashing when metadata is newer than the PDF."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_text('fake pdf')
+    os.utime(pdf_path, ns=(1_000_000_000, 1_000_000_000))
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    save_metadata(pdf_output_dir, FileMetadata(size=8, hash='abc123'))
+
+    should_skip, reason = should_skip_pdf(pdf_path, output_dir)
+    assert should_skip
+    assert reason == ''
+    mock_compute_hash.assert_not_called()
+
+
+def test_should_skip_pdf_hashes_when_pdf_is_newer(tmp_path: Path) -> None:
+    """Test that a PDF modified after its metadata is hashed."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_text('fake pdf')
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    save_metadata(pdf_output_dir, FileMetadata(size=8, hash='abc123'))
+    os.utime(pdf_output_dir / METADATA_FILENAME, ns=(1_000_000_000, 1_000_000_000))
 
     should_skip, reason = should_skip_pdf(pdf_path, output_dir)
+    assert not should_skip
+    assert reason == 'out of date (hash changed)'
+
+
+def test_should_skip_pdf_hash_changed(tmp_path: Path) -> None:
+    """Test not skipping when PDF content changed but size did not."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_text('fake pdf')
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    save_metadata(pdf_output_dir, FileMetadata(size=8, hash='abc123'))
+
+    should_skip, reason = should_skip_pdf(pdf_path, output_dir, trust_mtime=False)
+    assert not should_skip
+    assert reason == 'out of date (hash changed)'
+
+
+def test_file_metadata_from_file(tmp_path: Path) -> None:
+    """Test creating FileMetadata from a file on disk."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_bytes(b'fake pdf')
+
+    metadata = FileMetadata.from_file(pdf_path)
+
+    assert metadata.size == 8
+    assert metadata.algo == 'blake3'
+    assert metadata.hash == blake3.blake3(b'fake pdf').hexdigest()
+
+
+def test_file_metadata_from_large_file(tmp_path: Path) -> None:
+    """Test that memory-mapped hashing of large files matches hashing the bytes."""
+    content = b'fake pdf' * (MMAP_THRESHOLD // 8 + 1)
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_bytes(content)
+
+    assert FileMetadata.from_file(pdf_path).hash == blake3.blake3(content).hexdigest()
+    assert FileMetadata.from_file(pdf_path, 'sha256').hash == hashlib.sha256(content).hexdigest()
+
+
+def test_should_skip_pdf_legacy_sha256_metadata(tmp_path: Path) -> None:
+    """Test that metadata without a recorded algorithm is verified with SHA256."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_bytes(b'fake pdf')
+
+    pdf_output_dir = tmp_path / 'output' / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    (pdf_output_dir / METADATA_FILENAME).write_text(
+        json.dumps({'size': 8, 'hash': hashlib.sha256(b'fake pdf').hexdigest()})
+    )
+
+    should_skip, reason = should_skip_pdf(pdf_path, tmp_path / 'output', trust_mtime=False)
     assert should_skip
     assert reason == ''
+
+
+def test_check_pdf_returns_computed_metadata(tmp_path: Path) -> None:
+    """Test that a PDF hashed by the check returns its metadata."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_bytes(b'fake pdf')
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    save_metadata(pdf_output_dir, FileMetadata(size=8, hash='abc123'))
+
+    should_skip, reason, metadata = check_pdf(pdf_path, output_dir, trust_mtime=False)
+    assert not should_skip
+    assert reason == 'out of date (hash changed)'
+    assert metadata == FileMetadata.from_file(pdf_path)
+
+
+def test_check_pdf_no_metadata_without_hashing(tmp_path: Path) -> None:
+    """Test that no metadata is returned when the check doesn't hash the PDF."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_bytes(b'fake pdf')
+
+    output_dir = tmp_path / 'output'
+    pdf_output_dir = output_dir / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    save_metadata(pdf_output_dir, FileMetadata(size=8, hash='abc123'))
+
+    assert check_pdf(pdf_path, output_dir) == (True, '', None)
+
+
+def test_check_pdf_legacy_metadata_not_returned(tmp_path: Path) -> None:
+    """Test that a legacy SHA256 hash is not returned for saving."""
+    pdf_path = tmp_path / 'test.pdf'
+    pdf_path.write_bytes(b'fake pdf')
+
+    pdf_output_dir = tmp_path / 'output' / 'test'
+    pdf_output_dir.mkdir(parents=True)
+    (pdf_output_dir / METADATA_FILENAME).write_text(
+        json.dumps({'size': 8, 'hash': hashlib.sha256(b'changed!').hexdigest()})
+    )
+
+    should_skip, reason, metadata = check_pdf(pdf_path, tmp_path / 'output', trust_mtime=False)
+    assert not should_skip
+    assert reason == 'out of date (hash changed)'
+    assert metadata is None
@@ -0,0 +1,474 @@
+"""Tests for PDF processing and directory traversal."""
+
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from pypdf import PdfWriter
+
+from pdf_table_extractor.metadata import (
+    METADATA_FILENAME,
+    FileMetadata,
+    check_pdf,
+    load_metadata,
+    save_metadata,
+)
+from pdf_table_extractor.pdf_processor import (
+    _check_pdfs,
+    _collect_page_chunks,
+    _copy_tables,
+    _export_pdf_pages,
+    _find_duplicates,
+    _iter_pdfs,
+    _page_chunks,
+    _process_duplicates,
+    _process_single_pdf,
+    extract_tables_from_pdf,
+    process_directory,
+)
+
+
+def _write_pdf(path: Path, num_pages: int = 1) -> Path:
+    """Write a PDF of blank pages."""
+    writer = PdfWriter()
+    for _ in range(num_pages):
+        writer.add_blank_page(width=612, height=792)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('wb') as f:
+        writer.write(f)
+    return path
+
+
+def _touch(root: Path, *relative_paths: str) -> None:
+    """Create empty files under root."""
+    for relative_path in relative_paths:
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+
+def test_iter_pdfs_sorted(tmp_path: Path) -> None:
+    """Test that PDFs are found in the same order as a sorted recursive glob."""
+    _touch(
+        tmp_path,
+        'a.pdf',
+        'a/x.pdf',
+        'a/b/y.pdf',
+        'a.b/z.pdf',
+        'b.pdf',
+        'notes.txt',
+        '.hidden/h.pdf',
+    )
+    (tmp_path / 'dir.pdf').mkdir()
+
+    expected = sorted(
+        path
+        for path in tmp_path.glob('**/*.pdf')
+        if path.is_file() and '.hidden' not in path.relative_to(tmp_path).parts
+    )
+    assert list(_iter_pdfs(tmp_path, recursive=True)) == expected
+    assert [path.relative_to(tmp_path).as_posix() for path in expected] == [
+        'a/b/y.pdf',
+        'a/x.pdf',
+        'a.b/z.pdf',
+        'a.pdf',
+        'b.pdf',
+    ]
+
+
+def test_iter_pdfs_non_recursive(tmp_path: Path) -> None:
+    """Test that subdirectories are ignored unless searching recursively."""
+    _touch(tmp_path, 'b.pdf', 'a.pdf', 'sub/c.pdf')
+
+    assert list(_iter_pdfs(tmp_path, recursive=False)) == [tmp_path / 'a.pdf', tmp_path / 'b.pdf']
+
+
+def test_iter_pdfs_skips_directory_symlinks(tmp_path: Path) -> None:
+    """Test that symlinked directories are not followed."""
+    _touch(tmp_path, 'input/a.pdf', 'elsewhere/b.pdf')
+    (tmp_path / 'input' / 'link').symlink_to(tmp_path / 'elsewhere', target_is_directory=True)
+
+    assert list(_iter_pdfs(tmp_path / 'input', recursive=True)) == [tmp_path / 'input' / 'a.pdf']
+
+
+def test_check_pdfs_error(tmp_path: Path) -> None:
+    """Test that a failed check marks only that PDF as unprocessed."""
+    input_dir = tmp_path / 'input'
+    output_dir = tmp_path / 'output'
+    broken = _write_pdf(input_dir / 'a.pdf')
+    processed = _write_pdf(input_dir / 'b.pdf', 2)
+    (output_dir / 'b').mkdir(parents=True)
+    save_metadata(output_dir / 'b', FileMetadata.from_file(processed))
+
+    def check(pdf_path: Path, *args: Any, **kwargs: Any) -> tuple[bool, str, FileMetadata | None]:
+        if pdf_path == broken:
+            raise PermissionError(f'Permission denied: {pdf_path}')
+        return check_pdf(pdf_path, *args, **kwargs)
+
+    with patch('pdf_table_extractor.pdf_processor.check_pdf', side_effect=check):
+        checked = _check_pdfs(
+            [broken, processed], input_dir, output_dir, max_workers=2, trust_mtime=False
+        )
+
+    assert checked == [
+        (broken, (False, f'unexpected error: Permission denied: {broken}', None)),
+        (processed, (True, '', FileMetadata.from_file(processed))),
+    ]
+
+
+def test_iter_pdfs_unreadable_directory(tmp_path: Path) -> None:
+    """Test that a subdirectory that can't be read is skipped."""
+    _touch(tmp_path, 'a.pdf', 'locked/b.pdf', 'open/c.pdf')
+    scandir = os.scandir
+
+    def scan_readable(path: str | os.PathLike[str]) -> Any:
+        if Path(path) == tmp_path / 'locked':
+            raise PermissionError(f'Permission denied: {path}')
+        return scandir(path)
+
+    with patch('pdf_table_extractor.pdf_processor.os.scandir', side_effect=scan_readable):
+        pdf_files = list(_iter_pdfs(tmp_path, recursive=True))
+
+    assert pdf_files == [tmp_path / 'a.pdf', tmp_path / 'open' / 'c.pdf']
+
+
+def test_process_directory_missing_input_dir(tmp_path: Path, caplog: Any) -> None:
+    """Test that a missing input directory is reported as having no PDFs."""
+    input_dir = tmp_path / 'missing'
+
+    assert process_directory(input_dir, tmp_path / 'output')
+    assert f'No PDF files found in {input_dir}' in caplog.text
+
+
+def _metadata_future(metadata: FileMetadata) -> Future[FileMetadata]:
+    """Wrap metadata in a completed future."""
+    future: Future[FileMetadata] = Future()
+    future.set_result(metadata)
+    return future
+
+
+def test_page_chunks(tmp_path: Path) -> None:
+    """Test splitting a PDF into page ranges."""
+    pdf_path = _write_pdf(tmp_path / 'long.pdf', 120)
+
+    assert _page_chunks(pdf_path) == ['1-50', '51-100', '101-120']
+
+
+def test_page_chunks_exact_multiple(tmp_path: Path) -> None:
+    """Test that the last page range ends on the last page."""
+    pdf_path = _write_pdf(tmp_path / 'long.pdf', 100)
+
+    assert _page_chunks(pdf_path) == ['1-50', '51-100']
+
+
+def test_page_chunks_short_pdf(tmp_path: Path) -> None:
+    """Test that a PDF within the chunk size is a single page range."""
+    pdf_path = _write_pdf(tmp_path / 'short.pdf', 3)
+
+    assert _page_chunks(pdf_path) == ['1-3']
+    assert _page_chunks(pdf_path, chunk_size=2) == ['1-2', '3-3']
+
+
+def test_page_chunks_unreadable_pdf(tmp_path: Path) -> None:
+    """Test that an unreadable PDF is left whole."""
+    pdf_path = tmp_path / 'broken.pdf'
+    pdf_path.write_bytes(b'not a pdf')
+
+    assert _page_chunks(pdf_path) == ['all']
+
+
+def test_export_pdf_pages_error(tmp_path: Path) -> None:
+    """Test that a failed page range reports its error instead of raising."""
+    pdf_path = tmp_path / 'missing.pdf'
+
+    count, error = _export_pdf_pages((pdf_path, tmp_path / 'out', 'csv', 'stream', '1-50'))
+
+    assert count == 0
+    assert error is not None
+
+
+def test_collect_page_chunks(tmp_path: Path) -> None:
+    """Test that page range table counts are summed and metadata is saved."""
+    pdf_path = tmp_path / 'long.pdf'
+    pdf_output_dir = tmp_path / 'output' / 'long'
+    pdf_output_dir.mkdir(parents=True)
+    metadata = FileMetadata(size=100, hash='abc123')
+
+    result = _collect_page_chunks(
+        pdf_path, [(2, None), (0, None), (3, None)], pdf_output_dir, _metadata_future(metadata)
+    )
+
+    assert result == ('long.pdf', True, '5 table(s)')
+    assert load_metadata(pdf_output_dir) == metadata
+
+
+def test_collect_page_chunks_no_tables(tmp_path: Path) -> None:
+    """Test that a split PDF without tables saves no metadata."""
+    pdf_output_dir = tmp_path / 'output' / 'long'
+    metadata = FileMetadata(size=100, hash='abc123')
+
+    result = _collect_page_chunks(
+        tmp_path / 'long.pdf', [(0, None), (0, None)], pdf_output_dir, _metadata_future(metadata)
+    )
+
+    assert result == ('long.pdf', True, 'no tables found')
+    assert not (pdf_output_dir / METADATA_FILENAME).exists()
+
+
+def test_collect_page_chunks_error(tmp_path: Path) -> None:
+    """Test that a failed page range fails the whole PDF without saving metadata."""
+    pdf_output_dir = tmp_path / 'output' / 'long'
+    pdf_output_dir.mkdir(parents=True)
+    metadata = FileMetadata(size=100, hash='abc123')
+
+    result = _collect_page_chunks(
+        tmp_path / 'long.pdf',
+        [(2, None), (0, 'page range failed')],
+        pdf_output_dir,
+        _metadata_future(metadata),
+    )
+
+    assert result == ('long.pdf', False, 'page range failed')
+    assert not (pdf_output_dir / METADATA_FILENAME).exists()
+
+
+def _sizes(pdf_files: list[Path]) -> dict[Path, int]:
+    """Get the sizes of PDF files."""
+    return {pdf_path: pdf_path.stat().st_size for pdf_path in pdf_files}
+
+
+def test_find_duplicates(tmp_path: Path) -> None:
+    """Test grouping identical PDFs across directories."""
+    source = tmp_path / 'a' / 'x.pdf'
+    source.parent.mkdir()
+    source.write_bytes(b'%PDF-1.4 same')
+    duplicate = tmp_path / 'b' / 'y.pdf'
+    duplicate.parent.mkdir()
+    duplicate.write_bytes(b'%PDF-1.4 same')
+    same_size = tmp_path / 'z.pdf'
+    same_size.write_bytes(b'%PDF-1.4 diff')
+    unique = tmp_path / 'w.pdf'
+    unique.write_bytes(b'%PDF-1.4 unique size')
+    pdf_files = [source, same_size, unique, duplicate]
+
+    duplicates = _find_duplicates(pdf_files, _sizes(pdf_files), {}, max_workers=2)
+
+    assert duplicates == {source: (FileMetadata.from_file(source), [duplicate])}
+
+
+def test_find_duplicates_unique_sizes(tmp_path: Path) -> None:
+    """Test that PDFs with unique sizes are not hashed."""
+    first = tmp_path / 'a.pdf'
+    first.write_bytes(b'%PDF-1.4 a')
+    second = tmp_path / 'b.pdf'
+    second.write_bytes(b'%PDF-1.4 bb')
+    pdf_files = [first, second]
+
+    with patch('pdf_table_extractor.pdf_processor.FileMetadata.from_file') as mock_from_file:
+        assert _find_duplicates(pdf_files, _sizes(pdf_files), {}, max_workers=2) == {}
+        mock_from_file.assert_not_called()
+
+
+def test_find_duplicates_unreadable_pdf(tmp_path: Path) -> None:
+    """Test that a PDF that can't be hashed is left out of deduplication."""
+    unreadable = tmp_path / 'a.pdf'
+    unreadable.write_bytes(b'%PDF-1.4 same')
+    source = tmp_path / 'b.pdf'
+    source.write_bytes(b'%PDF-1.4 same')
+    duplicate = tmp_path / 'c.pdf'
+    duplicate.write_bytes(b'%PDF-1.4 same')
+    pdf_files = [unreadable, source, duplicate]
+    from_file = FileMetadata.from_file
+
+    def hash_readable(pdf_path: Path) -> FileMetadata:
+        if pdf_path == unreadable:
+            raise PermissionError(f'Permission denied: {pdf_path}')
+        return from_file(pdf_path)
+
+    with patch(
+        'pdf_table_extractor.pdf_processor.FileMetadata.from_file', side_effect=hash_readable
+    ):
+        duplicates = _find_duplicates(pdf_files, _sizes(pdf_files), {}, max_workers=2)
+
+    assert duplicates == {source: (from_file(source), [duplicate])}
+
+
+def test_find_duplicates_known_metadata(tmp_path: Path) -> None:
+    """Test that known hashes are reused and new hashes are recorded."""
+    source = tmp_path / 'a.pdf'
+    source.write_bytes(b'%PDF-1.4 same')
+    duplicate = tmp_path / 'b.pdf'
+    duplicate.write_bytes(b'%PDF-1.4 same')
+    other = tmp_path / 'c.pdf'
+    other.write_bytes(b'%PDF-1.4 diff')
+    pdf_files = [source, duplicate, other]
+    known_metadata = {source: FileMetadata.from_file(source)}
+    from_file = FileMetadata.from_file
+
+    with patch(
+        'pdf_table_extractor.pdf_processor.FileMetadata.from_file', side_effect=from_file
+    ) as mock_from_file:
+        duplicates = _find_duplicates(pdf_files, _sizes(pdf_files), known_metadata, max_workers=2)
+
+    assert sorted(call.args[0] for call in mock_from_file.call_args_list) == [duplicate, other]
+    assert duplicates == {source: (known_metadata[source], [duplicate])}
+    assert known_metadata == {pdf_path: from_file(pdf_path) for pdf_path in pdf_files}
+
+
+def test_copy_tables(tmp_path: Path) -> None:
+    """Test that exported tables are copied with the duplicate's name."""
+    source_dir = tmp_path / 'x'
+    source_dir.mkdir()
+    (source_dir / 'x-page-1-table-1.csv').write_text('a,b\n')
+    (source_dir / 'x-page-2-table-1.csv').write_text('c,d\n')
+    save_metadata(source_dir, FileMetadata(size=100, hash='abc123'))
+    target_dir = tmp_path / 'other' / 'y'
+
+    _copy_tables(source_dir, 'x', target_dir, 'y')
+
+    assert sorted(path.name for path in target_dir.iterdir()) == [
+        'y-page-1-table-1.csv',
+        'y-page-2-table-1.csv',
+    ]
+    assert (target_dir / 'y-page-2-table-1.csv').read_text() == 'c,d\n'
+
+
+def test_process_duplicates(tmp_path: Path) -> None:
+    """Test that duplicates in other directories get the source's tables and metadata."""
+    input_dir = tmp_path / 'input'
+    output_dir = tmp_path / 'output'
+    source_dir = output_dir / 'a' / 'x'
+    source_dir.mkdir(parents=True)
+    (source_dir / 'x-page-1-table-1.csv').write_text('a,b\n')
+    metadata = FileMetadata(size=100, hash='abc123')
+
+    results = _process_duplicates(
+        input_dir / 'a' / 'x.pdf',
+        ('x.pdf', True, '1 table(s)'),
+        metadata,
+        [input_dir / 'b' / 'y.pdf', input_dir / 'z.pdf'],
+        input_dir,
+        output_dir,
+    )
+
+    assert results == [
+        ('y.pdf', True, '1 table(s) (copied from x.pdf)'),
+        ('z.pdf', True, '1 table(s) (copied from x.pdf)'),
+    ]
+    for target_dir, stem in [(output_dir / 'b' / 'y', 'y'), (output_dir / 'z', 'z')]:
+        assert (target_dir / f'{stem}-page-1-table-1.csv').read_text() == 'a,b\n'
+        assert load_metadata(target_dir) == metadata
+
+
+def test_process_duplicates_failed_source(tmp_path: Path) -> None:
+    """Test that a failed source's error is reported for its duplicates."""
+    results = _process_duplicates(
+        tmp_path / 'x.pdf',
+        ('x.pdf', False, 'boom'),
+        FileMetadata(size=100, hash='abc123'),
+        [tmp_path / 'y.pdf'],
+        tmp_path,
+        tmp_path / 'output',
+    )
+
+    assert results == [('y.pdf', False, 'boom')]
+    assert not (tmp_path / 'output').exists()
+
+
+def test_process_duplicates_no_tables(tmp_path: Path) -> None:
+    """Test that duplicates of a PDF without tables get no outputs."""
+    results = _process_duplicates(
+        tmp_path / 'x.pdf',
+        ('x.pdf', True, 'no tables found'),
+        FileMetadata(size=100, hash='abc123'),
+        [tmp_path / 'y.pdf'],
+        tmp_path,
+        tmp_path / 'output',
+    )
+
+    assert results == [('y.pdf', True, 'no tables found')]
+    assert not (tmp_path / 'output').exists()
+
+
+def test_process_duplicates_copy_error(tmp_path: Path) -> None:
+    """Test that a failed copy is reported as an error for that duplicate."""
+    results = _process_duplicates(
+        tmp_path / 'x.pdf',
+        ('x.pdf', True, '1 table(s)'),
+        FileMetadata(size=100, hash='abc123'),
+        [tmp_path / 'y.pdf'],
+        tmp_path,
+        tmp_path / 'output',
+    )
+
+    [(filename, success, _message)] = results
+    assert filename == 'y.pdf'
+    assert not success
+
+
+def test_extract_tables_uses_precomputed_metadata(tmp_path: Path) -> None:
+    """Test that metadata passed in is saved without hashing the PDF again."""
+    pdf_path = _write_pdf(tmp_path / 'x.pdf')
+    metadata = FileMetadata(size=100, hash='abc123')
+    tables = MagicMock()
+    tables.__len__.return_value = 2
+
+    with (
+        patch('pdf_table_extractor.pdf_processor.camelot.read_pdf', return_value=tables),
+        patch('pdf_table_extractor.pdf_processor.FileMetadata.from_file') as mock_from_file,
+    ):
+        result = extract_tables_from_pdf(
+            pdf_path, tmp_path / 'output', skip_existing=False, metadata=metadata
+        )
+        mock_from_file.assert_not_called()
+
+    assert result == ('x.pdf', True, '2 table(s)')
+    assert load_metadata(tmp_path / 'output' / 'x') == metadata
+
+
+class _BrokenPoolExecutor:
+    """Executor whose worker dies after returning the first PDF's result."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def __enter__(self) -> '_BrokenPoolExecutor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def map(self, fn: Callable[..., Any], tasks: Iterable[Any]) -> Iterator[Any]:
+        if fn is not _process_single_pdf:
+            return map(fn, tasks)
+        return self._broken_results(list(tasks))
+
+    @staticmethod
+    def _broken_results(tasks: list[Any]) -> Iterator[Any]:
+        yield (tasks[0][0].name, True, '1 table(s)')
+        raise BrokenProcessPool('A process in the process pool was terminated abruptly')
+
+
+def test_process_directory_broken_pool(tmp_path: Path, caplog: Any) -> None:
+    """Test that PDFs left without a result are reported as errors when a worker dies."""
+    input_dir = tmp_path / 'input'
+    # Distinct sizes, so no PDF is a duplicate and the largest (c.pdf) is dispatched first
+    _write_pdf(input_dir / 'a.pdf', 1)
+    _write_pdf(input_dir / 'b.pdf', 2)
+    _write_pdf(input_dir / 'c.pdf', 3)
+    caplog.set_level(logging.INFO)
+
+    with patch('pdf_table_extractor.pdf_processor.ProcessPoolExecutor', _BrokenPoolExecutor):
+        assert process_directory(input_dir, tmp_path / 'output', skip_existing=False)
+
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert errors == [
+        '✗ b.pdf: unexpected error: A process in the process pool was terminated abruptly',
+        '✗ a.pdf: unexpected error: A process in the process pool was terminated abruptly',
+    ]
+    assert '1 processed, 0 skipped, 2 errors (total: 3)' in caplog.text